@@ -15,11 +15,13 @@ class PaintStep:
     affected_layer: Layer
 
     def undo_apply(self, grid: Grid):
-        sq = grid[self.affected_grid_square[0]][self.affected_grid_square[1]]
+        row, col = self.affected_grid_square
+        sq = grid[row, col]
         sq.erase(self.affected_layer)
 
     def redo_apply(self, grid: Grid):
-        sq = grid[self.affected_grid_square[0]][self.affected_grid_square[1]]
+        row, col = self.affected_grid_square
+        sq = grid[row, col]
         sq.add(self.affected_layer)
 
 
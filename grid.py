@@ -1,7 +1,61 @@
 from __future__ import annotations
 from data_structures.referential_array import ArrayR
 from data_structures.array_sorted_list import ArraySortedList
-from layer_store import SetLayerStore
+from layer_store import SetLayerStore, AdditiveLayerStore, SequenceLayerStore
+
+class GridRow:
+    """
+    A view of a single row of a Grid.
+    Indexing the view reads and writes the square straight from the grid's flat array.
+    """
+
+    __slots__ = ("owner", "squares", "start", "length")
+
+    def __init__(self, grid: Grid, start: int, length: int) -> None:
+        """
+        Parameters:
+        grid (Grid): The grid this row belongs to.
+        start (int): The flat index of the first square in this row.
+        length (int): The number of squares in the row.
+        """
+        self.owner = grid
+        #the ArrayR's underlying array is indexed directly, saving a Python-level __getitem__ call per access
+        self.squares = grid.squares.array
+        self.start = start
+        self.length = length
+
+    def __len__(self) -> int:
+        return self.length
+
+    #cell access is the hot path, so the index handling is kept inline rather than calling a helper
+    def __getitem__(self, col: int) -> LayerStore:
+        """
+        Return the layer store in the given column of this row.
+        Negative columns count from the end of the row, as for rows.
+        :raises IndexError: if col is not in [-length, length)
+        """
+        if col < 0:
+            col += self.length
+        if not 0 <= col < self.length:
+            raise IndexError(col)
+        store = self.squares[self.start + col]
+        if store is None:
+            store = self.owner.create_square(self.start + col)
+        return store
+
+    def __setitem__(self, col: int, item: LayerStore) -> None:
+        """
+        Set the layer store in the given column of this row.
+        Negative columns count from the end of the row, as for rows.
+        :raises IndexError: if col is not in [-length, length)
+        """
+        if col < 0:
+            col += self.length
+        if not 0 <= col < self.length:
+            raise IndexError(col)
+        self.squares[self.start + col] = item
+
+
 class Grid:
     DRAW_STYLE_SET = "SET"
     DRAW_STYLE_ADD = "ADD"
@@ -27,53 +81,99 @@ class Grid:
         Should also intialise the brush size to the DEFAULT provided as a class variable.
         """
 
-        #checking for correcr draw style
-        if draw_style in self.DRAW_STYLE_OPTIONS:
-            self.draw_style = draw_style
-        else:
-            print('Draw style not correct')
+        #checking for correct draw style
+        if draw_style not in _STORE_CLS:
+            raise ValueError(f"Draw style should be one of {self.DRAW_STYLE_OPTIONS}, got {draw_style!r}")
+        self.draw_style = draw_style
         self.brush_size = self.DEFAULT_BRUSH_SIZE
 
         #a grid is created based on the number of rows and columns i.e. x and y axis
         #Then each box in the grid is set with a layer depending on the draw style used
         self.rows = x
         self.cols = y
-        self.grid = ArrayR(self.rows)
+        #the squares are kept in one flat row-major array, square (i, j) lives at i * cols + j
+        #squares start out as None and get their store the first time they are accessed (see create_square())
+        self.squares = ArrayR(self.rows * self.cols)
 
-        for i in range(0, self.rows):
-            self.grid[i] = ArrayR(self.cols)
-            for j in range(self.cols):
-                if self.draw_style == 'Set':
-                    self.grid[i][j] = SetLayerStore()
-                elif self.draw_style == 'Additive':
-                    self.grid[i][j] = AdditiveLayerStore()
-                elif self.draw_style == 'Sequential':
-                    self.grid[i][j] = SequenceLayerStore()
+        #the store class is resolved once here rather than re-checking the draw style for every square
+        self.store_cls = _STORE_CLS[self.draw_style]
+        #number of specials activated so far, needed to bring squares created later up to date
+        self.special_count = 0
+
+        #self.grid holds one view per row, made up front so grid[i][j] does not allocate
+        self.grid = ArrayR(self.rows)
+        for i in range(self.rows):
+            self.grid[i] = GridRow(self, i * self.cols, self.cols)
 
     #the two magic methods below access each square in the grid. __getitem__ returns the layer implemented in the grid while __setitem__ enters a layer on the grid.
-    def __getitem__(self, key: int) -> ArrayR[LayerStore]:
+    def __getitem__(self, key: int | tuple[int, int]) -> GridRow | LayerStore:
         """
-        Return the specified row of the grid.
+        Return the specified row of the grid, or a single square when given (row, col).
 
         Parameters:
-        key (int): The index of the row to return.
+        key (int | tuple): The index of the row to return, or the (row, col) of a square.
 
         Returns:
-        The specified row of the grid.
+        The specified row of the grid, or the layer store at grid[row, col].
+        grid[row, col] indexes the flat array without going through a row view.
+
+        Negative rows and columns count from the end, as for grid[row][col].
+
+        :raises IndexError: if a (row, col) position is outside the grid.
         """
-        return self.grid[key]
+        #like GridRow, reads index the ArrayRs' underlying arrays directly to skip a Python-level call
+        if isinstance(key, tuple):
+            row, col = key
+            if row < 0:
+                row += self.rows
+            if col < 0:
+                col += self.cols
+            if not (0 <= row < self.rows and 0 <= col < self.cols):
+                raise IndexError(key)
+            store = self.squares.array[row * self.cols + col]
+            if store is None:
+                store = self.create_square(row * self.cols + col)
+            return store
+        return self.grid.array[key]
 
-    def __setitem__(self, item: LayerStore, row: int, col: int) -> None:
+    def create_square(self, k: int) -> LayerStore:
         """
-        Set the layer store of a given position in the grid.
+        Create and return the layer store at flat index k, which has not been accessed yet.
+
+        A store that was never touched is an empty store, so no store is allocated
+        until a square is actually accessed. Building a grid is still O(rows * cols), since the flat
+        array is filled with None, but it allocates no LayerStore objects.
+        Callers check for None inline and only call this on a square's first access,
+        so later reads are a plain array read and never write to the grid.
+        Specials already activated on the grid are replayed on the new store: an empty store is
+        unchanged by an even number of specials, so only the parity matters.
+        """
+        store = self.store_cls()
+        if self.special_count % 2 == 1:
+            store.special()
+        self.squares[k] = store
+        return store
+
+    def __setitem__(self, key: tuple[int, int], item: LayerStore) -> None:
+        """
+        Set the layer store of a given position in the grid, as grid[row, col] = item.
 
         Parameters:
+        key (tuple): The (row, col) position in the grid.
         item (LayerStore): The layer store to set.
-        row (int): The row index of the grid.
-        col (int): The column index of the grid.
 
+        Negative rows and columns count from the end, as for grid[row][col].
+
+        :raises IndexError: if the position is outside the grid.
         """
-        self.grid[row][col] = item
+        row, col = key
+        if row < 0:
+            row += self.rows
+        if col < 0:
+            col += self.cols
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            raise IndexError(key)
+        self.squares[row * self.cols + col] = item
 
     # raise NotImplementedError()
 
@@ -95,8 +195,54 @@ class Grid:
         if self.brush_size > self.MIN_BRUSH:
             self.brush_size -= 1
 
+    def render(self, start: tuple[int, int, int], timestamp: float) -> ArrayR[ArrayR[tuple[int, int, int]]]:
+        """
+        Return the colour of every grid square for a single frame.
+
+        Parameters:
+        start (tuple): The background colour every square starts from.
+        timestamp (float): The current timestamp.
+
+        Returns:
+        An array of rows, where colours[x][y] is the colour of square (x, y).
+
+        The start colour is shared by every square rather than copied per square,
+        and the rows are walked once, so a full frame is a single O(rows * cols) pass.
+        Squares that were never accessed, and empty SetLayerStores, are resolved without calling into a store.
+        """
+        colours = ArrayR(self.rows)
+        k = 0
+        for x in range(self.rows):
+            out = ArrayR(self.cols)
+            for y in range(self.cols):
+                square = self.squares[k]
+                k += 1
+                #an untouched or empty SetLayerStore always shows the start colour, so skip the get_color call
+                if square is None or (type(square) is SetLayerStore and square.layer is None):
+                    out[y] = start
+                else:
+                    out[y] = square.get_color(start, timestamp, x, y)
+            colours[x] = out
+        return colours
+
     def special(self):
         """
         Activate the special affect on all grid squares.
+
+        Each store only flips its own state (e.g. the invert flag of a SetLayerStore),
+        so this is a single O(rows * cols) pass over the grid.
+        Squares without a store yet are caught up by create_square() when they are first accessed.
         """
-        raise NotImplementedError()
+        self.special_count += 1
+        for k in range(self.rows * self.cols):
+            store = self.squares[k]
+            if store is not None:
+                store.special()
+
+
+#maps each draw style to the LayerStore used on its grid squares
+_STORE_CLS = {
+    Grid.DRAW_STYLE_SET: SetLayerStore,
+    Grid.DRAW_STYLE_ADD: AdditiveLayerStore,
+    Grid.DRAW_STYLE_SEQUENCE: SequenceLayerStore,
+}
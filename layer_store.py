@@ -1,14 +1,15 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from layer_util import Layer
-from data_structures.referential_array import ArrayR
-from data_structures.queue_adt import Queue, CircularQueue, TestQueue
-from data_structures.stack_adt import Stack, ArrayStack, ArrayR
-from data_structures.array_sorted_list import ArraySortedList
+from collections import deque
+from operator import attrgetter
+from layer_util import Layer, LAYERS
+from data_structures.bset import BSet
 from layers import rainbow, black, lighten, invert, red, green, blue, sparkle, darken
 
 class LayerStore(ABC):
 
+    __slots__ = ()
+
     def __init__(self) -> None:
         pass
 
@@ -51,12 +52,17 @@ class SetLayerStore(LayerStore):
     - special: Invert the color output for all layers.
     """
 
+    # one store per grid square, so keep instances free of a per-instance __dict__
+    __slots__ = ("layer", "inverted")
+
     def __init__(self) -> None:
         """
         Initialize the SetLayerStore object.
+        Only the current layer and whether the output is inverted are kept,
+        rather than an array slot for every layer index.
         """
         self.layer: Optional[Layer] = None
-        self.layers: ArrayR[Optional[Layer]] = ArrayR(20)
+        self.inverted: bool = False
 
     def add(self, layer: Layer) -> bool:
         """
@@ -66,31 +72,27 @@ class SetLayerStore(LayerStore):
         - layer: The layer to be added.
 
         Returns:
-        - A boolean indicating whether the addition was successful or not.
+        - A boolean indicating whether the store was changed or not.
         """
-        if layer is not None:
-            self.layers[layer.index] = layer
-            self.layer = layer
-            return True
-        else:
+        if layer is None or layer is self.layer:
             return False
+        self.layer = layer
+        return True
 
     def erase(self, layer: Layer) -> bool:
         """
-        Remove a layer from the layer store.
+        Remove the layer from the layer store, ignoring the layer given.
 
         Args:
-        - layer: The layer to be removed.
+        - layer: The currently selected layer (unused).
 
         Returns:
-        - A boolean indicating whether the removal was successful or not.
+        - A boolean indicating whether the store was changed or not.
         """
-        if self.layers[layer.index] is not None:
-            self.layers[layer.index] = None
-            self.layer = None
-            return True
-        else:
+        if self.layer is None:
             return False
+        self.layer = None
+        return True
 
     def get_color(self, start: Tuple[int, int, int], timestamp: int, x: int, y: int) -> Tuple[int, int, int]:
         """
@@ -105,35 +107,19 @@ class SetLayerStore(LayerStore):
         Returns:
         - A tuple containing the RGB values of the color of the pixel.
         """
-        if self.layer is not None:
-            return self.layer.apply(start, timestamp, x, y)
-        else:
+        if self.layer is None:
             return start
+        r, g, b = self.layer.apply(start, timestamp, x, y)
+        if self.inverted:
+            return 255 - r, 255 - g, 255 - b
+        return r, g, b
 
     def special(self) -> None:
         """
         Invert the color output for all layers.
         """
-        for i in range(len(self.layers)):
-            if self.layers[i] is not None:
-                self.layers[i].apply = self.invert_color(self.layers[i].apply)
+        self.inverted = not self.inverted
 
-    @staticmethod
-    def invert_color(f):
-        """
-        Invert the color of a pixel.
-
-        Args:
-        - f: A function that applies a color to a pixel.
-
-        Returns:
-        - A function that inverts the color of a pixel.
-        """
-        def inv(start, timestamp, x, y):
-            r, g, b = f(start, timestamp, x, y)
-            return 255 - r, 255 - g, 255 - b
-
-        return inv
 class AdditiveLayerStore(LayerStore):
     """
     Additive layer store. Each added layer applies after all previous ones.
@@ -142,69 +128,49 @@ class AdditiveLayerStore(LayerStore):
     - special: Reverse the order of current layers (first becomes last, etc.)
     """
 
+    __slots__ = ("layers",)
+
+    MAX_LAYERS = 100
+
     def __init__(self) -> None:
-        """Initializes the store with an empty stack and queue."""
-        self.stack: ArrayStack = ArrayStack(max_capacity=100)
-        self.queue: CircularQueue = CircularQueue(max_capacity=100)
+        """Initializes the store with an empty deque, oldest layer on the left."""
+        self.layers: deque[Layer] = deque()
 
-    def add(self, layer: Optional[Layer]) -> None:
-        """Adds a layer to the store."""
-        self.stack.push(layer)
-        self.queue.append(layer)
+    def add(self, layer: Layer) -> bool:
+        """Adds a layer to be applied last. Returns False if the store is full."""
+        if len(self.layers) >= self.MAX_LAYERS:
+            return False
+        self.layers.append(layer)
+        return True
 
     def special(self) -> None:
-        """Adds the top layer to the bottom."""
-        layer = self.stack.top()
-        self.stack.pop()
-        self.stack.push(layer)
-        self.queue.append(layer)
-        for i in range(len(self.queue) - 1):
-            self.queue.append(self.queue.serve())
-
-    def get_color(self, background_color: Tuple[int, int, int], x: int, y: int, z: int) -> Tuple[int, int, int]:
-        """Returns the additive color of all layers in the store."""
-        color = list(background_color)
-        temp_stack = ArrayStack(max_capacity=100)
-        while not self.stack.is_empty():
-            layer = self.stack.pop()
-            layer_color = layer.color if isinstance(layer, Layer) else (0, 0, 0)
-            for i in range(3):
-                color[i] += layer_color[i]
-            temp_stack.push(layer)
-        while not temp_stack.is_empty():
-            self.stack.push(temp_stack.pop())
-        return tuple(color)
-
-    def erase(self, index: int) -> None:
-        """Erases the layer at the given index."""
-        # create temporary queue to store layers being removed
-        temp_queue = CircularQueue(max_capacity=100)
-        # remove layers from stack and add to temp_queue until reaching the layer at the index to be removed
-        for i in range(len(self.stack)):
-            layer = self.stack.peek()
-            if i == index:
-                self.stack.pop()
-                break
-            else:
-                self.stack.pop()
-                temp_queue.append(layer)
-        # add back layers from temp_queue to stack in reverse order
-        while not temp_queue.is_empty():
-            self.stack.push(temp_queue.serve())
-        # remove layers from queue and add back to queue until reaching the layer at the index to be removed
-        for i in range(len(self.queue)):
-            layer = self.queue.serve()
-            if i == index:
-                break
-            else:
-                self.queue.append(layer)
-        # add back layers from temp_queue to queue
-        while not temp_queue.is_empty():
-            self.queue.append(temp_queue.serve())
+        """Reverses the order of the current layers."""
+        self.layers.reverse()
+
+    def get_color(self, start: Tuple[int, int, int], timestamp: int, x: int, y: int) -> Tuple[int, int, int]:
+        """Applies every layer in the store, oldest first, on top of the start colour."""
+        # most squares hold zero or one layer, so answer those without setting up the loop
+        n = len(self.layers)
+        if n == 0:
+            return start
+        if n == 1:
+            return self.layers[0].apply(start, timestamp, x, y)
+        color = start
+        for layer in self.layers:
+            color = layer.apply(color, timestamp, x, y)
+        return color
+
+    def erase(self, layer: Layer) -> bool:
+        """Removes the first layer that was added, ignoring the layer given."""
+        if not self.layers:
+            return False
+        self.layers.popleft()
+        return True
 
 class SequenceLayerStore(LayerStore):
     """
     Sequential layer store. Each layer type is either applied / not applied, and is applied in order of index.
+    Only layer indices are stored, so only registered layers (those in layer_util.LAYERS) are accepted.
     - add: Ensure this layer type is applied.
     - erase: Ensure this layer type is not applied.
     - special:
@@ -212,57 +178,74 @@ class SequenceLayerStore(LayerStore):
         In the event of two layers being the median names, pick the lexicographically smaller one.
     """
 
+    __slots__ = ("layers",)
+
     def __init__(self) -> None:
         """ SequenceLayerStore object initialiser. """
 
         # calling the initialiser for the LayerStore
         super().__init__()
 
-        # initialising the internal array sorted list
-        self.layers = ArraySortedList(100)
+        # initialising the bit set of applied layers.
+        # BSet only holds positive integers, so layer i is stored as i + 1.
+        self.layers = BSet()
 
     def add(self, layer: Layer) -> bool:
         """ Add a layer to the store.
             Returns true if the SequenceLayerStore was actually changed.
         """
 
+        item = self.set_item(layer)
+
         # checking if layer already exists in the store
-        if layer in self.layers:
+        if item in self.layers:
             return False
 
         # adding layer to the store
-        self.layers.add(layer)
+        self.layers.add(item)
         return True
 
-    def get_color(self, start: int, timestamp: int, x: int, y: int) -> Tuple[int, int, int]:
+    def get_color(self, start: Tuple[int, int, int], timestamp: int, x: int, y: int) -> Tuple[int, int, int]:
         """ Returns the colour this square should show, given the current layers. """
 
-        # creating a stack of valid layers based on start and timestamp
-        valid_layers = Stack()
-        curr_layer = None
-        for layer in self.layers:
-            if layer.timestamp <= timestamp and layer.start <= start:
-                curr_layer = layer
-                valid_layers.push(curr_layer)
-
-        # processing layers in the order of their indices in valid_layers, starting from the top
-        color = curr_layer.get_color(x, y)
-        while not valid_layers.is_empty():
-            layer = valid_layers.pop()
-            if layer.get_color(x, y) != curr_layer.get_color(x, y):
-                color = layer.get_color(x, y)
-                curr_layer = layer
-
+        # applying the applied layers in order of their index
+        color = start
+        for index in self.applied_indices():
+            color = LAYERS[index].apply(color, timestamp, x, y)
         return color
 
+    @staticmethod
+    def set_item(layer: Layer) -> int:
+        """ Returns the BSet item for this layer.
+            Layers are looked up again by index in get_color, so the layer must be the
+            one registered at that index.
+            :raises ValueError: if the layer is not a registered layer.
+        """
+        if not (0 <= layer.index < len(LAYERS) and LAYERS[layer.index] is layer):
+            raise ValueError(f"{layer!r} is not a registered layer")
+        return layer.index + 1
+
+    def applied_indices(self):
+        """ Yields the indices of the applied layers in increasing order.
+            Only the set bits are visited: the lowest one is isolated with elems & -elems
+            and then cleared, so the cost is one step per applied layer.
+        """
+        elems = self.layers.elems
+        while elems:
+            low = elems & -elems
+            yield low.bit_length() - 1
+            elems ^= low
+
     def erase(self, layer: Layer) -> bool:
         """ Complete the erase action with this layer
             Returns true if the SequenceLayerStore was actually changed.
         """
 
+        item = self.set_item(layer)
+
         # removing layer from the store if it exists
-        if layer in self.layers:
-            self.layers.remove(layer)
+        if item in self.layers:
+            self.layers.remove(item)
             return True
 
         return False
@@ -272,22 +255,11 @@ class SequenceLayerStore(LayerStore):
             In the event of two layers being the median names, pick the lexicographically smaller one.
         """
 
-        # creating a queue to store all layers
-        layer_queue = CircularQueueQueue()
-        for layer in self.layers:
-            layer_queue.append(layer)
-
-        # sorting the queue of layers by their names
-        layer_queue.sort(key=lambda x: x.name)
-
-        # finding the median layer(s)
-        median_layers = List()
-        while not layer_queue.is_empty():
-            median_layers.append(layer_queue.serve())
-            if not layer_queue.is_empty():
-                layer_queue.serve()
-        median_layers.sort()
-
-        # removing the median layer(s) from the store
-        for layer in median_layers:
-            self.erase(layer)
+        # collecting the applied layers and sorting them by name
+        applied = [LAYERS[index] for index in self.applied_indices()]
+        if not applied:
+            return
+        applied.sort(key=attrgetter("name"))
+
+        # with an even count, (n - 1) // 2 picks the lexicographically smaller median
+        self.erase(applied[(len(applied) - 1) // 2])
@@ -5,6 +5,37 @@ All layers are defined here.
 import colorsys
 from layer_util import background, register
 
+# Per-channel functions for the layers that map each channel on its own,
+# and lookup tables built from them for every int channel in [0, 255].
+def lighten_channel(c):
+    return min(255, c + 40)
+
+def darken_channel(c):
+    return max(0, c - 40)
+
+def invert_channel(c):
+    return 255 - c
+
+LIGHTEN_LUT = tuple(lighten_channel(c) for c in range(256))
+DARKEN_LUT = tuple(darken_channel(c) for c in range(256))
+INVERT_LUT = tuple(invert_channel(c) for c in range(256))
+
+def map_channels(table, channel, color):
+    """
+    Map each channel of color through table.
+    Anything the table does not cover (negative or above 255, non-int channels,
+    or not exactly three channels) falls back to channel(c),
+    so the result is always the same as applying channel to every value.
+    """
+    try:
+        r, g, b = color
+        # negative ints would index the table from the end, so send them to the fallback
+        if r >= 0 and g >= 0 and b >= 0:
+            return (table[r], table[g], table[b])
+    except (ValueError, TypeError, IndexError):
+        pass
+    return tuple(channel(c) for c in color)
+
 @register
 @background(200, 0, 120)
 def rainbow(color, timestamp, x, y):
@@ -21,18 +52,12 @@ def black(color, timestamp, x, y):
 @register
 @background(240, 240, 240)
 def lighten(color, timestamp, x, y):
-    return tuple(
-        min(255, x + 40)
-        for x in color
-    )
+    return map_channels(LIGHTEN_LUT, lighten_channel, color)
 
 @register
 @background(0, 255, 255)
 def invert(color, timestamp, x, y):
-    return tuple(
-        255 - c
-        for c in color
-    )
+    return map_channels(INVERT_LUT, invert_channel, color)
 
 @register
 @background(255, 0, 0)
@@ -68,7 +93,4 @@ def sparkle(color, timestamp, x, y):
 @register
 @background(30, 30, 30)
 def darken(color, timestamp, x, y):
-    return tuple(
-        max(0, x - 40)
-        for x in color
-    )
\ No newline at end of file
+    return map_channels(DARKEN_LUT, darken_channel, color)
\ No newline at end of file
@@ -121,14 +121,16 @@ class MyWindow(arcade.Window):
         # UI - Draw Modes / Action buttons
         self.action_buttons.draw()
         # Grid
+        colours = self.grid.render(tuple(self.BG), self.timestamp)
         for x in range(self.GRID_SIZE_X):
+            column = colours[x]
             for y in range(self.GRID_SIZE_Y):
                 arcade.draw_lrtb_rectangle_filled(
                     self.GRID_SQ_WIDTH * x,
                     self.GRID_SQ_WIDTH * (x+1),
                     self.GRID_SQ_HEIGHT * (y+1),
                     self.GRID_SQ_HEIGHT * y,
-                    self.grid[x][y].get_color(self.BG[:], self.timestamp, x, y),
+                    column[y],
                 )
 
     def on_mouse_press(self, x: int, y: int, button: int, modifiers: int) -> None:
@@ -307,7 +309,7 @@ class MyWindow(arcade.Window):
         for i in range(max(0, px - self.grid.brush_size), min(self.grid.rows, px + self.grid.brush_size + 1)):
             for j in range(max(0, py - self.grid.brush_size), min(self.grid.cols, py + self.grid.brush_size + 1)):
                 if abs(i - px) + abs(j - py) <= self.grid.brush_size:
-                    self.grid.__setitem__(layer, i, j)
+                    self.grid[i][j].add(layer)
 
     def on_undo(self):
         """Called when an undo is requested."""
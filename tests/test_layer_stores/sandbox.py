@@ -31,7 +31,7 @@ def main():
 
     print(t[0][1])
 
-    mygrid = Grid("some", 4, 4)
+    mygrid = Grid(Grid.DRAW_STYLE_SET, 4, 4)
     print(mygrid[1][0])
     mygrid[3][2] = 'Hello'
     # look at the following
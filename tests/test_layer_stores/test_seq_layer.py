@@ -2,6 +2,7 @@ import unittest
 from ed_utils.decorators import number
 
 from layer_store import SequenceLayerStore
+from layer_util import Layer
 from layers import black, lighten, rainbow, invert
 
 class TestSeqLayer(unittest.TestCase):
@@ -69,3 +70,13 @@ class TestSeqLayer(unittest.TestCase):
         self.assertEqual(s.get_color((100, 100, 100), 7, 0, 0), (0, 0, 0))
         s.erase(black)
         self.assertEqual(s.get_color((100, 100, 100), 7, 0, 0), (91, 214, 104))
+
+    @number("3.6")
+    def test_unregistered_layer(self):
+        s = SequenceLayerStore()
+        fake = Layer(lighten.index, lambda color, timestamp, x, y: (1, 2, 3))
+        with self.assertRaises(ValueError):
+            s.add(fake)
+        with self.assertRaises(ValueError):
+            s.erase(fake)
+        self.assertEqual(s.get_color((100, 100, 100), 0, 0, 0), (100, 100, 100))
@@ -53,3 +53,17 @@ class TestSetLayer(unittest.TestCase):
         self.assertEqual(s.get_color((0, 0, 0), 7, 0, 0), (0, 0, 0))
         s.add(invert)
         self.assertEqual(s.get_color((0, 0, 0), 7, 0, 0), (255, 255, 255))
+
+    @number("1.6")
+    def test_special_does_not_touch_layer(self):
+        s = SetLayerStore()
+        other = SetLayerStore()
+        s.add(lighten)
+        other.add(lighten)
+        apply = lighten.apply
+        for _ in range(5):
+            s.special()
+        # The shared layer must not be wrapped, so only s is inverted.
+        self.assertIs(lighten.apply, apply)
+        self.assertEqual(s.get_color((100, 100, 100), 0, 0, 0), (255-140, 255-140, 255-140))
+        self.assertEqual(other.get_color((100, 100, 100), 0, 0, 0), (140, 140, 140))
@@ -0,0 +1,110 @@
+import unittest
+from ed_utils.decorators import number
+
+from grid import Grid
+from layer_store import SetLayerStore, AdditiveLayerStore, SequenceLayerStore
+from layers import black, lighten, rainbow, invert, red
+
+class TestGrid(unittest.TestCase):
+
+    @number("7.1")
+    def test_render(self):
+        bg = (100, 100, 100)
+        for style in Grid.DRAW_STYLE_OPTIONS:
+            grid = Grid(style, 4, 3)
+            grid[0][0].add(red)
+            grid[1][2].add(rainbow)
+            grid[1][2].add(lighten)
+            grid[3][1].add(invert)
+            grid[3][1].add(black)
+            self.assertRenderMatches(grid, bg, 7)
+            grid.special()
+            self.assertRenderMatches(grid, bg, 7)
+            grid.special()
+            self.assertRenderMatches(grid, bg, 3)
+
+    @number("7.2")
+    def test_render_other_store(self):
+        grid = Grid(Grid.DRAW_STYLE_SET, 2, 2)
+        grid[0, 0] = AdditiveLayerStore()
+        grid[0][0].add(lighten)
+        grid[1][1].add(red)
+        self.assertRenderMatches(grid, (0, 0, 0), 0)
+
+    @number("7.3")
+    def test_negative_index(self):
+        grid = Grid(Grid.DRAW_STYLE_SET, 3, 4)
+        self.assertIs(grid[-1][0], grid[2][0])
+        self.assertIs(grid[0][-1], grid[0][3])
+        self.assertIs(grid[-1, -1], grid[2][3])
+        store = AdditiveLayerStore()
+        grid[-3, -4] = store
+        self.assertIs(grid[0][0], store)
+        other = AdditiveLayerStore()
+        grid[1][-2] = other
+        self.assertIs(grid[1, 2], other)
+        for key in [(3, 0), (0, 4), (-4, 0), (0, -5)]:
+            with self.assertRaises(IndexError):
+                grid[key]
+        with self.assertRaises(IndexError):
+            grid[0][4]
+        with self.assertRaises(IndexError):
+            grid[0][-5]
+        with self.assertRaises(IndexError):
+            grid[3]
+
+    @number("7.4")
+    def test_special_before_access_set(self):
+        bg = (100, 100, 100)
+        grid = Grid(Grid.DRAW_STYLE_SET, 3, 3)
+        grid.special()
+        # (1, 1) is first accessed after the special, so it must start inverted.
+        grid[1][1].add(lighten)
+        self.assertEqual(grid[1][1].get_color(bg, 0, 1, 1), (255-140, 255-140, 255-140))
+        control = SetLayerStore()
+        control.special()
+        control.add(lighten)
+        self.assertEqual(grid[1][1].get_color(bg, 0, 1, 1), control.get_color(bg, 0, 1, 1))
+        grid.special()
+        # (0, 2) has now seen two specials, so it behaves like a fresh store.
+        grid[0, 2].add(lighten)
+        self.assertEqual(grid[0][2].get_color(bg, 0, 0, 2), (140, 140, 140))
+        self.assertEqual(grid[1][1].get_color(bg, 0, 1, 1), (140, 140, 140))
+        self.assertRenderMatches(grid, bg, 0)
+
+    @number("7.5")
+    def test_special_before_access_add_seq(self):
+        bg = (100, 100, 100)
+        for style, store_cls in [
+            (Grid.DRAW_STYLE_ADD, AdditiveLayerStore),
+            (Grid.DRAW_STYLE_SEQUENCE, SequenceLayerStore),
+        ]:
+            for specials in (1, 2, 3):
+                grid = Grid(style, 2, 2)
+                for _ in range(specials):
+                    grid.special()
+                square = grid[1][0]
+                control = store_cls()
+                self.assertEqual(square.get_color(bg, 7, 1, 0), control.get_color(bg, 7, 1, 0))
+                for layer in (rainbow, invert, lighten):
+                    square.add(layer)
+                    control.add(layer)
+                self.assertEqual(square.get_color(bg, 7, 1, 0), control.get_color(bg, 7, 1, 0))
+                square.special()
+                control.special()
+                self.assertEqual(square.get_color(bg, 7, 1, 0), control.get_color(bg, 7, 1, 0))
+
+    @number("7.6")
+    def test_unknown_draw_style(self):
+        with self.assertRaises(ValueError):
+            Grid("some", 2, 2)
+
+    def assertRenderMatches(self, grid: Grid, bg, timestamp):
+        colours = grid.render(bg, timestamp)
+        for x in range(grid.rows):
+            for y in range(grid.cols):
+                self.assertEqual(
+                    colours[x][y],
+                    grid[x][y].get_color(bg, timestamp, x, y),
+                    f"render() differs from get_color() at {(x, y)} for {grid.draw_style}"
+                )